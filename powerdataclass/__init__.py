@@ -1,47 +1,70 @@
 import dataclasses
 import json
+import sys
+import typing
+import weakref
+from collections import OrderedDict, defaultdict
 from enum import Enum
-from functools import partial
-from typing import Mapping, Iterable, Any, Callable, TypeVar, ByteString
+from functools import lru_cache
+from types import MethodType
+from typing import Mapping, Iterable, Any, Callable, TypeVar, ByteString, NamedTuple, Optional
 from graphlib import TopologicalSorter
 
 
-def _is_iterable_but_not_string_type(value_type):
-    return issubclass(value_type, Iterable) and not (issubclass(value_type, ByteString) or issubclass(value_type, str))
+# results of `_is_iterable_but_not_string_type` keyed by type, as the ABC subclass checks are relatively expensive.
+# The keys are weak, so that the classes of the values seen by `as_dict` and casting are not kept alive
+_ITERABLE_BUT_NOT_STRING_TYPES = weakref.WeakKeyDictionary()
 
 
-def _is_iterable_but_not_string(value):
-    return isinstance(value, Iterable) and not (isinstance(value, ByteString) or isinstance(value, str))
+def _is_iterable_but_not_string_type(value_type):
+    result = _ITERABLE_BUT_NOT_STRING_TYPES.get(value_type)
+    if result is None:
+        result = _ITERABLE_BUT_NOT_STRING_TYPES[value_type] = (
+                issubclass(value_type, Iterable)
+                and not (issubclass(value_type, ByteString) or issubclass(value_type, str))
+        )
+    return result
 
 
-def powercast(value: Any, _type: Any, type_casters: Mapping[Any, Callable] = None) -> Any:
+def _is_iterable_but_not_string(value):
+    return _is_iterable_but_not_string_type(type(value))
+
+
+_PRIMITIVE_TYPES = (int, float, bool, str)
+# the builtin types known to be (or not to be) mappings and iterables, checked before the slower ABC checks.
+# Mappings are iterables too, but they are never in `_ITERABLE_TYPES`
+_MAPPING_TYPES = frozenset((dict, OrderedDict, defaultdict))
+_ITERABLE_TYPES = frozenset((list, tuple, set, frozenset, str, bytes, bytearray, range))
+# the builtin collections which can be iterated more than once without side effects
+_BUILTIN_COLLECTION_TYPES = frozenset((list, tuple, set, frozenset))
+# values of these types are immutable and are never converted in `PowerDataclass.as_dict`
+_SCALAR_TYPES = frozenset((int, float, bool, str, bytes, type(None)))
+
+# caches of casters, built by `_create_caster`:
+# - the casters of builtin classes, which live as long as the interpreter, are kept in a plain dict;
+# - the casters of other classes are kept only as long as the classes are alive;
+# - the casters of other types, like generic aliases, are kept in a bounded LRU cache (see `_get_alias_caster`),
+#   where the equal aliases (like `list[int]` evaluated at different call sites) share a single entry.
+_CASTERS = {}
+_CLASS_CASTERS = weakref.WeakKeyDictionary()
+_ALIAS_CASTERS_MAXSIZE = 1024
+
+
+def _create_class_caster(klass_ref: Callable[[], type]) -> Callable[[Any, Mapping[Any, Callable]], Any]:
     """
-    Casts a `value` to a given `_type`. Descends recursively to cast generic subscripted types.
-    If target type is a dataclass and value is a mapping, this dataclass will be instantiated by unpacking the mapping.
-    :param value: a value to be cast
-    :param _type: a type to cast the `value` to. Can be either a primitive type (like `bool` or `list`)
-    or a generic subscripted type (like `typing.List[int]`).
-    Casting to generic non-subscripted types like `typing.List` is forbidden.
-    Casting to generic types, subscripted with TypeVars (like `typing.List[typing.TypeVar('T')`]) is forbidden.
-    Casting to generic subscripted types, which are not derived from a primitive type (like `typing.Iterable[str]`)
-    is forbidden.
-    :param type_casters: a mapping of {type: callable}. If passed, functions from this mapping will be applied to the
-    `value` using `_type` as a key.
-    :return: `value` cast to `_type`
+    Same as `_create_caster` for a non-builtin class. The caster refers to the class only through the `klass_ref`
+    weak reference, so that `_CLASS_CASTERS` does not keep the class alive.
     """
-    type_casters = type_casters or {}
-
-    value_type = type(value)
-    field_type_origin = getattr(_type, '__origin__', None)
-
-    if value_type == _type:
-        return value
-
-    if _type in type_casters:
-        return type_casters[_type](value)
-
-    if dataclasses.is_dataclass(_type):
-        if issubclass(value_type, Mapping):
+    if not dataclasses.is_dataclass(klass_ref()):
+        return lambda value, type_casters: klass_ref()(value)
+
+    def cast_to_dataclass(value, type_casters):
+        _type = klass_ref()
+        value_type = type(value)
+        # the builtin containers are recognized without the ABC checks
+        if value_type in _MAPPING_TYPES or (
+                value_type not in _ITERABLE_TYPES and issubclass(value_type, Mapping)
+        ):
             return _type(**value)
         elif _is_iterable_but_not_string_type(value_type):
             return _type(*value)
@@ -58,6 +81,20 @@ def powercast(value: Any, _type: Any, type_casters: Mapping[Any, Callable] = Non
                                  f'while it is {value_type.__name__} now'
                                  )
 
+    return cast_to_dataclass
+
+
+def _create_caster(_type: Any) -> Callable[[Any, Mapping[Any, Callable]], Any]:
+    """
+    Resolves how values are cast to a given `_type` and returns a caster: a callable of (value, type_casters).
+    All the checks which depend only on the `_type` are done here once, so that `powercast` only has to call the
+    caster. Raises `TypeError` if casting to `_type` is forbidden.
+    """
+    if isinstance(_type, type) and _type.__module__ != 'builtins':
+        return _create_class_caster(weakref.ref(_type))
+
+    field_type_origin = getattr(_type, '__origin__', None)
+
     if field_type_origin in (list, dict, tuple, set, frozenset):
         # Ensure that for subscriptable types, the types of elements (or keys and values) are defined
         _type_args = getattr(_type, '__args__', tuple())
@@ -68,30 +105,129 @@ def powercast(value: Any, _type: Any, type_casters: Mapping[Any, Callable] = Non
             item_type = _type_args[0]
             if type(item_type) == TypeVar:
                 raise TypeError(f'Casting to a TypeVar {_type} is forbidden')
-            if not issubclass(value_type, Iterable):
-                raise ValueError(f'Cannot cast a non-Iterable value {value} to {field_type_origin}')
-
-            return field_type_origin((powercast(item, item_type, type_casters) for item in value))
+            item_type_is_primitive = item_type in _PRIMITIVE_TYPES
+            item_caster = _get_item_caster(item_type)
+
+            def cast_to_sequence(value, type_casters):
+                if type(value) not in _ITERABLE_TYPES and not issubclass(type(value), Iterable):
+                    raise ValueError(f'Cannot cast a non-Iterable value {value} to {field_type_origin}')
+
+                if item_type_is_primitive and not (type_casters and item_type in type_casters):
+                    # primitive constructors return the values of their own type as-is,
+                    # so the items can be cast in a single C-level loop without recursing into `powercast`
+                    if type(value) in _BUILTIN_COLLECTION_TYPES:
+                        # the values rebuilt from `as_dict` output usually hold items of the right type already,
+                        # a pass of identity checks is cheaper than calling the constructor on every item
+                        for item in value:
+                            if type(item) is not item_type:
+                                break
+                        else:
+                            return field_type_origin(value)
+                    return field_type_origin(map(item_type, value))
+
+                # list comprehensions are cheaper than feeding generator expressions to the constructors
+                if item_caster is None or (type_casters and item_type in type_casters):
+                    items = [powercast(item, item_type, type_casters) for item in value]
+                else:
+                    items = [item if type(item) is item_type else item_caster(item, type_casters) for item in value]
+
+                return items if field_type_origin is list else field_type_origin(items)
+
+            return cast_to_sequence
 
         elif field_type_origin is dict:
-            key_type = _type_args[0]
-            value_type = _type_args[1]
+            key_type, value_type = _type_args[0], _type_args[1]
             if type(key_type) == TypeVar or type(value_type) == TypeVar:
                 raise TypeError(f'Casting to a TypeVar {_type} is forbidden')
-            if not (issubclass(value_type, Mapping) or hasattr(value, 'items')):
-                raise ValueError(f'Cannot cast a non-Mapping value {value} to {field_type_origin}')
-
-            return field_type_origin({
-                powercast(key, key_type): powercast(value, value_type, type_casters)
-                for key, value in value.items()
-            }
-            )
+            key_caster, value_caster = _get_item_caster(key_type), _get_item_caster(value_type)
+
+            def cast_to_mapping(value, type_casters):
+                if type(value) not in _MAPPING_TYPES and not (
+                        issubclass(type(value), Mapping) or hasattr(value, 'items')
+                ):
+                    raise ValueError(f'Cannot cast a non-Mapping value {value} to {field_type_origin}')
+
+                if key_caster is None or value_caster is None or (
+                        type_casters and (key_type in type_casters or value_type in type_casters)
+                ):
+                    return {
+                        powercast(k, key_type, type_casters): powercast(v, value_type, type_casters)
+                        for k, v in value.items()
+                    }
+
+                return {
+                    (k if type(k) is key_type else key_caster(k, type_casters)):
+                        (v if type(v) is value_type else value_caster(v, type_casters))
+                    for k, v in value.items()
+                }
+
+            return cast_to_mapping
 
     elif field_type_origin:
         raise TypeError(f'Casting to a generic type {_type} is forbidden')
-    else:
-        # this is not a generic type, cast directly by instantiating
-        return _type(value)
+
+    # this is not a generic type, cast directly by instantiating
+    return lambda value, type_casters: _type(value)
+
+
+_get_alias_caster = lru_cache(maxsize=_ALIAS_CASTERS_MAXSIZE)(_create_caster)
+
+
+def _get_caster(_type: Any) -> Callable[[Any, Mapping[Any, Callable]], Any]:
+    if isinstance(_type, type):
+        casters = _CASTERS if _type.__module__ == 'builtins' else _CLASS_CASTERS
+        caster = casters.get(_type)
+        if caster is None:
+            caster = casters[_type] = _create_caster(_type)
+        return caster
+
+    try:
+        hash(_type)
+    except TypeError:
+        # unhashable types can't be cached, their casters are created on every call
+        return _create_caster(_type)
+    return _get_alias_caster(_type)
+
+
+def _get_item_caster(item_type: Any) -> Callable[[Any, Mapping[Any, Callable]], Any]:
+    """
+    Returns a caster for items of a collection, so that the collection casters can call it directly
+    instead of going through `powercast` for every item. Returns None if casting to `item_type` is forbidden:
+    in this case `powercast` will raise when (and if) there is an actual item to cast.
+    """
+    try:
+        return _get_caster(item_type)
+    except TypeError:
+        return None
+
+
+def powercast(value: Any, _type: Any, type_casters: Mapping[Any, Callable] = None) -> Any:
+    """
+    Casts a `value` to a given `_type`. Descends recursively to cast generic subscripted types.
+    If target type is a dataclass and value is a mapping, this dataclass will be instantiated by unpacking the mapping.
+    :param value: a value to be cast
+    :param _type: a type to cast the `value` to. Can be either a primitive type (like `bool` or `list`)
+    or a generic subscripted type (like `typing.List[int]`).
+    Casting to generic non-subscripted types like `typing.List` is forbidden.
+    Casting to generic types, subscripted with TypeVars (like `typing.List[typing.TypeVar('T')`]) is forbidden.
+    Casting to generic subscripted types, which are not derived from a primitive type (like `typing.Iterable[str]`)
+    is forbidden.
+    :param type_casters: a mapping of {type: callable}. If passed, functions from this mapping will be applied to the
+    `value` using `_type` as a key.
+    :return: `value` cast to `_type`
+    """
+    if type(value) is _type:
+        return value
+
+    if type_casters and _type in type_casters:
+        return type_casters[_type](value)
+
+    # the lookup of the builtin classes casters is inlined here to save a call on the hot path
+    try:
+        caster = _CASTERS[_type]
+    except (KeyError, TypeError):
+        caster = _get_caster(_type)
+    return caster(value, type_casters)
 
 
 # FunkyTools:
@@ -114,6 +250,283 @@ def collapse_classes(klasses, klass_name, klass_type=None):
     return type(klass_name, (klass_type or last_klass,), klass__dict__)
 
 
+# bit flags of a field, stored in a fields handling plan. See `_create_fields_plan`
+_FIELD_SKIP_TYPECASTING = 1
+_FIELD_NULLABLE = 2
+_FIELD_HAS_DEFAULT = 4
+
+
+def _resolve_annotation(klass, name, annotation):
+    """
+    Evaluates the string `annotation` of the field `name` of `klass` in the namespaces of the class which declared it,
+    like `typing.get_type_hints` does it. Returns the `annotation` as is if it can't be evaluated.
+    """
+    for base_klass in klass.__mro__:
+        if name in base_klass.__dict__.get('__annotations__', {}):
+            break
+    else:
+        base_klass = klass
+
+    # the class is not bound to its name while it's being created, so its name is added here for self-references.
+    # The module names take precedence over the class ones, just like in `typing.get_type_hints`
+    class_namespace = {base_klass.__name__: base_klass, **vars(base_klass)}
+    module_namespace = getattr(sys.modules.get(base_klass.__module__), '__dict__', {})
+    annotation_holder = type('_AnnotationHolder', (), {'__annotations__': {name: annotation}})
+    try:
+        return typing.get_type_hints(annotation_holder, class_namespace, module_namespace)[name]
+    except Exception:
+        # evaluating an annotation can fail in any way (undefined names, missing attributes, bad syntax)
+        return annotation
+
+
+def _resolve_field_types(klass):
+    """
+    Returns a {field name: type} mapping for the fields of `klass`. String annotations (forward references or
+    the ones postponed by `from __future__ import annotations`) are resolved here, field by field.
+    Annotations which can't be resolved at class creation are kept as is, the fields handler generated for `klass`
+    tries to resolve them again on the first instantiation, see `_resolve_deferred_field_types`.
+    """
+    field_types = {field.name: field.type for field in dataclasses.fields(klass)}
+
+    for name, field_type in field_types.items():
+        if isinstance(field_type, str):
+            field_types[name] = _resolve_annotation(klass, name, field_type)
+
+    return field_types
+
+
+def _resolve_deferred_field_types(klass):
+    """
+    Called by the generated fields handler of `klass` if some of the annotations of its typecasted fields were not
+    resolved at class creation (e.g. references to classes declared later in a module). If more of them can be
+    resolved now, regenerates the fields plan and the generated methods of `klass` and returns True.
+    """
+    resolved_types = _resolve_field_types(klass)
+    if resolved_types == klass.__pdc_resolved_types__:
+        return False
+
+    klass.__pdc_resolved_types__ = resolved_types
+    klass.__pdc_plan__ = _create_fields_plan(klass)
+    _install_generated_methods(klass, lambda method_name: getattr(
+        klass.__dict__.get(method_name), '__pdc_replaceable__', False
+    ))
+    return True
+
+
+def _create_fields_plan(klass):
+    """
+    Precomputes everything needed to handle the fields of `klass` into a tuple of (name, type, handler, flags)
+    records, ordered by the fields handling order. `handler` is either a field handler or a type handler
+    (field handlers take precedence) or None, `flags` is a bitmask of `_FIELD_*` flags.
+    """
+    plan = []
+
+    for field in klass.__pdc_field_handling_order__:
+        field_type = klass.__pdc_resolved_types__[field.name]
+        handler = klass.__pdc_field_handlers__.get(field.name) or klass.__pdc_type_handlers__.get(field_type)
+
+        flags = 0
+        if field.metadata.get(FieldMeta.SKIP_TYPECASTING, False):
+            flags |= _FIELD_SKIP_TYPECASTING
+        if field.metadata.get(FieldMeta.NULLABLE, False):
+            flags |= _FIELD_NULLABLE
+        # Turns out, there _is_ a way to check for a missing default ᕕ( ᐛ )ᕗ
+        if field.default is not dataclasses.MISSING:
+            flags |= _FIELD_HAS_DEFAULT
+
+        plan.append((field.name, field_type, handler, flags))
+
+    return tuple(plan)
+
+
+def _create_fields_handler(klass):
+    """
+    Generates the source of a `__pdc_handle_fields__` method specialized for the fields plan of `klass`,
+    along with a `__post_init__` running the same code, which is used unless the user has overridden `__post_init__`.
+    All the decisions which depend only on the class (handling order, handlers, metadata flags) are made here once,
+    so the generated method is a straight-line block of statements per field.
+    Just like `dataclasses` does it for `__init__`, the generated function is created inside a factory function to
+    bind the handlers and types as closure variables, while the module globals (`powercast`) are looked up at runtime.
+    """
+    closure_vars = {}
+    body_lines = []
+    uses_powercast = False
+    uses_dict = False
+    has_unresolved_types = False
+
+    # the instance `__dict__` can be accessed directly only for the fields which the dataclass `__init__` is known
+    # to have stored there: not for the slotted ones, the ones set through a data descriptor or a custom `__setattr__`
+    dict_field_names = set()
+    if klass.__pdc_meta__.dataclass_init and klass.__setattr__ is object.__setattr__:
+        dict_field_names.update(field.name for field in dataclasses.fields(klass) if field.init)
+        for base_klass in klass.__mro__:
+            for member_name, member in base_klass.__dict__.items():
+                if member_name == '__slots__':
+                    dict_field_names.difference_update((member,) if isinstance(member, str) else member)
+                elif hasattr(type(member), '__set__'):
+                    dict_field_names.discard(member_name)
+
+    for i, (name, _type, handler, flags) in enumerate(klass.__pdc_plan__):
+        if flags & _FIELD_SKIP_TYPECASTING:
+            continue
+
+        if name in dict_field_names:
+            # the value was just stored in the instance `__dict__` by `__init__`,
+            # accessing it directly skips the attribute lookup machinery
+            uses_dict = True
+            value_getter, value_setter = f'self_dict[{name!r}]', f'self_dict[{name!r}] = {{}}'
+        else:
+            value_getter, value_setter = f'self.{name}', f'self.{name} = {{}}'
+
+        body_lines.append(f'value = {value_getter}')
+
+        if handler is not None:
+            closure_vars[f'_handler_{i}'] = handler
+            body_lines.append(value_setter.format(f'_handler_{i}(self, value)'))
+        else:
+            closure_vars[f'_type_{i}'] = _type
+            body_lines.append('if value is None:')
+            if flags & (_FIELD_NULLABLE | _FIELD_HAS_DEFAULT):
+                body_lines.append('    pass')
+            else:
+                body_lines.append(f'    raise ValueError(f\'A value for {{self.__class__.__name__}} '
+                                  f'field `{name}` cannot be None\')')
+            if isinstance(_type, type):
+                # values of the exact declared type need no casting
+                body_lines.append(f'elif type(value) is not _type_{i}:')
+            else:
+                # no value can be of a generic alias type (like `typing.List[int]`), don't even check
+                body_lines.append('else:')
+            uses_powercast = True
+            has_unresolved_types = has_unresolved_types or isinstance(_type, str)
+            body_lines.append('    ' + value_setter.format(f'powercast(value, _type_{i}, type_casters)'))
+
+    if uses_dict:
+        body_lines.insert(0, 'self_dict = self.__dict__')
+
+    if uses_powercast:
+        # type handlers are bound to the instance once and shared by all the `powercast` calls, recursive ones included
+        closure_vars['_type_handlers'] = klass.__pdc_type_handlers__
+        if klass.__pdc_type_handlers__:
+            body_lines.insert(0, 'type_casters = {k: MethodType(v, self) for k, v in _type_handlers.items()}')
+        else:
+            body_lines.insert(0, 'type_casters = _type_handlers')
+
+    if has_unresolved_types:
+        # retry resolving the annotations once the classes they refer to may be declared
+        body_lines[:0] = ['if _resolve_deferred_field_types(_klass):',
+                          '    return self.__pdc_handle_fields__()']
+
+    closure_vars['_klass'] = klass
+    body = '\n'.join(f'        {line}' for line in body_lines or ['pass'])
+    source = (f'def __create_fn__({", ".join(closure_vars)}):\n'
+              f'    def __pdc_handle_fields__(self):\n'
+              f'{body}\n'
+              f'    def __post_init__(self):\n'
+              f'        if type(self) is not _klass:\n'
+              f'            # reached from a subclass, e.g. through `super().__post_init__()`\n'
+              f'            return self.__pdc_handle_fields__()\n'
+              f'{body}\n'
+              f'    return __pdc_handle_fields__, __post_init__\n')
+
+    namespace = {}
+    exec(compile(source, f'<pdc:{klass.__qualname__}>', 'exec'), globals(), namespace)
+    functions = namespace['__create_fn__'](**closure_vars)
+    for fn in functions:
+        fn.__qualname__ = f'{klass.__qualname__}.{fn.__name__}'
+    functions[1].__pdc_replaceable__ = True
+    return functions
+
+
+def _create_as_dict(klass):
+    """
+    Generates an `as_dict` method specialized for the fields of `klass`: the field names are inlined as literals
+    and the values of immutable scalar types are put into the resulting dict without a call.
+    """
+    getter_lines = [f'v{i} = self.{name}' for i, name in enumerate(klass.__pdc_field_names__)]
+    items = ''.join(
+        f'{name!r}: v{i} if type(v{i}) in _SCALAR_TYPES else _convert_to_dict(v{i}, force), '
+        for i, name in enumerate(klass.__pdc_field_names__)
+    )
+    body = '\n'.join(f'        {line}' for line in (*getter_lines, f'return {{{items}}}'))
+    source = (f'def __create_fn__(_klass, _as_dict):\n'
+              f'    def as_dict(self, force=False):\n'
+              f'        if type(self) is not _klass:\n'
+              f'            # reached from a subclass, e.g. through `super().as_dict()`\n'
+              f'            return _as_dict(self, force)\n'
+              f'{body}\n'
+              f'    return as_dict\n')
+
+    namespace = {}
+    exec(compile(source, f'<pdc:{klass.__qualname__}>', 'exec'), globals(), namespace)
+    fn = namespace['__create_fn__'](klass, _fields_to_dict)
+    fn.__qualname__ = f'{klass.__qualname__}.{fn.__name__}'
+    fn.__pdc_replaceable__ = True
+    return fn
+
+
+def _fields_to_dict(pdc, force):
+    return {name: _convert_to_dict(getattr(pdc, name), force) for name in pdc.__pdc_field_names__}
+
+
+def _inherits_replaceable(klass, spec, method_name):
+    """
+    Tells whether the `method_name` method of `klass` can be replaced by a generated one, i.e. it is neither defined
+    on `klass` itself nor overridden by the user anywhere in the MRO.
+    """
+    if method_name in spec:
+        return False
+
+    for base_klass in klass.__mro__[1:]:
+        method = base_klass.__dict__.get(method_name)
+        if method is not None:
+            return getattr(method, '__pdc_replaceable__', False)
+
+    return False
+
+
+def _rebind_class_cells(spec, original_klass, klass):
+    """
+    `dataclasses.dataclass(slots=True)` replaces a class with a new one, but the `__class__` cells of its methods
+    (used by argumentless `super()`) still point to the `original_klass`. Repoint them to the new `klass`.
+    The cells of the functions borrowed from other classes point elsewhere and are left alone.
+    """
+    for member in spec.values():
+        if isinstance(member, (classmethod, staticmethod)):
+            functions = (member.__func__,)
+        elif isinstance(member, property):
+            functions = (member.fget, member.fset, member.fdel)
+        else:
+            functions = (member,)
+
+        for function in functions:
+            closure = getattr(function, '__closure__', None)
+            if not closure:
+                continue
+            for var_name, cell in zip(function.__code__.co_freevars, closure):
+                if var_name != '__class__':
+                    continue
+                try:
+                    if cell.cell_contents is original_klass:
+                        cell.cell_contents = klass
+                except ValueError:
+                    # an empty cell
+                    pass
+
+
+def _install_generated_methods(klass, is_replaceable):
+    """
+    Generates the fields handler of `klass`, along with `__post_init__` and `as_dict` for the ones of them
+    which `is_replaceable(method_name)`.
+    """
+    klass.__pdc_handle_fields__, post_init = _create_fields_handler(klass)
+    if is_replaceable('__post_init__'):
+        # the dataclass `__init__` calls the generated handler directly, skipping a call
+        klass.__post_init__ = post_init
+    if is_replaceable('as_dict'):
+        klass.as_dict = _create_as_dict(klass)
+
+
 class PowerDataclassDefaultMeta:
     dataclass_init = True
     dataclass_repr = True
@@ -121,87 +534,150 @@ class PowerDataclassDefaultMeta:
     dataclass_order = False
     dataclass_unsafe_hash = False
     dataclass_frozen = False
+    dataclass_slots = False
     singleton = False
     json_encoder = None
     json_decoder = None
     as_dict_ignore_when_nested = False
 
 
+# the standard `Meta` params of a PDC, collapsed once at class creation and stored as `__pdc_meta__`.
+# `Meta` itself is kept, as subclasses may define params of their own (e.g. `PowerConfig`'s `envvar_prefix`).
+class PowerDataclassMetaParams(NamedTuple):
+    dataclass_init: bool
+    dataclass_repr: bool
+    dataclass_eq: bool
+    dataclass_order: bool
+    dataclass_unsafe_hash: bool
+    dataclass_frozen: bool
+    dataclass_slots: bool
+    singleton: bool
+    json_encoder: Optional[type]
+    json_decoder: Optional[type]
+    as_dict_ignore_when_nested: bool
+
+
+def _collect_handlers(members, field_handlers, type_handlers):
+    # handlers are marked at decoration time, so a single attribute probe per member tells if it has to be registered
+    for method in members:
+        handled_field = getattr(method, '__pdc_field_handler_field__', None)
+        if handled_field is not None:
+            field_handlers[handled_field] = method
+        handled_type = getattr(method, '__pdc_type_handler_type__', None)
+        if handled_type is not None:
+            type_handlers[handled_type] = method
+
+
 class PowerDataclassBase(type):
     def __new__(mcs, name, bases, spec):
+        if '__dataclass_params__' in spec:
+            # `dataclasses.dataclass(slots=True)` recreates an already processed class, either below or when a PDC
+            # is decorated with it explicitly. In the latter case the generated methods were made for the layout
+            # of the discarded class, so they are regenerated
+            klass = super().__new__(mcs, name, bases, spec)
+            if '__pdc_plan__' in spec:
+                _install_generated_methods(klass, lambda method_name: getattr(
+                    spec.get(method_name), '__pdc_replaceable__', False
+                ))
+            return klass
+
         klass = super().__new__(mcs, name, bases, spec)
         klass_type_handlers = {}
         klass_field_handlers = {}
 
-        for base_klass in klass.__mro__:
-            klass_field_handlers.update(getattr(base_klass, '__pdc_field_handlers__', {}))
-            klass_type_handlers.update(getattr(base_klass, '__pdc_type_handlers__', {}))
+        if len(bases) == 1 and '__pdc_field_handlers__' in bases[0].__dict__:
+            # a single PDC base already holds every inherited handler in the right precedence, copy its registries once
+            klass_field_handlers.update(bases[0].__pdc_field_handlers__)
+            klass_type_handlers.update(bases[0].__pdc_type_handlers__)
+        else:
+            # the registries of the bases overlap under multiple inheritance, so collect the handlers declared
+            # by each class of the MRO, from the most basic to the most derived one
+            for base_klass in reversed(klass.__mro__[1:]):
+                _collect_handlers(base_klass.__dict__.values(), klass_field_handlers, klass_type_handlers)
 
-        for method_name, method in spec.items():
-            if hasattr(method, '__pdc_field_handler_field__'):
-                klass_field_handlers.update({method.__pdc_field_handler_field__: method})
-            if hasattr(method, '__pdc_type_handler_type__'):
-                klass_type_handlers.update({method.__pdc_type_handler_type__: method})
+        _collect_handlers(spec.values(), klass_field_handlers, klass_type_handlers)
 
         klass.Meta = collapse_classes((PowerDataclassDefaultMeta,
                                        *(klass.Meta for klass in (*bases, klass) if hasattr(klass, 'Meta'))),
                                       f'Meta', object
                                       )
+        klass.__pdc_meta__ = meta = PowerDataclassMetaParams._make(
+            getattr(klass.Meta, param) for param in PowerDataclassMetaParams._fields
+        )
         klass.__pdc_type_handlers__ = klass_type_handlers
         klass.__pdc_field_handlers__ = klass_field_handlers
 
+        # `Meta` params used by instance methods are resolved once
+        klass.__pdc_json_encoder__ = meta.json_encoder
+        klass.__pdc_json_decoder__ = meta.json_decoder
+        klass.__pdc_as_dict_ignore_when_nested__ = meta.as_dict_ignore_when_nested
+
+        # classes declaring their own `__slots__` are already slotted, `dataclasses` would refuse to add them
+        slots = meta.dataclass_slots and '__slots__' not in spec
+
         # convert to a dataclass, respecting the `dataclass_` Meta params
+        original_klass = klass
         klass = dataclasses.dataclass(klass,
-                                      init=klass.Meta.dataclass_init,
-                                      repr=klass.Meta.dataclass_repr,
-                                      eq=klass.Meta.dataclass_eq,
-                                      order=klass.Meta.dataclass_order,
-                                      unsafe_hash=klass.Meta.dataclass_unsafe_hash,
-                                      frozen=klass.Meta.dataclass_frozen,
+                                      init=meta.dataclass_init,
+                                      repr=meta.dataclass_repr,
+                                      eq=meta.dataclass_eq,
+                                      order=meta.dataclass_order,
+                                      unsafe_hash=meta.dataclass_unsafe_hash,
+                                      frozen=meta.dataclass_frozen,
+                                      slots=slots,
                                       )
+        if slots:
+            _rebind_class_cells(spec, original_klass, klass)
 
-        for field in dataclasses.fields(klass):
-            if field.metadata.get(FieldMeta.DEPENDS_ON_FIELDS, []) and field.name not in klass.__pdc_field_handlers__:
-                raise MissingFieldHandler(f'A field handler must be registered on {klass.__name__} for '
-                                          f'a field named `{field.name}` because it is declared as calculatable.'
-                                          )
+        def __pdc_determine_field_dependencies__(cls):
+            field_dependencies = {}
 
-        def __pdc_determine_field_handling_order__(cls):
-            fields = dataclasses.fields(cls)
+            for field in dataclasses.fields(cls):
+                depends_on_fields = field.metadata.get(FieldMeta.DEPENDS_ON_FIELDS)
+                if depends_on_fields:
+                    if field.name not in cls.__pdc_field_handlers__:
+                        raise MissingFieldHandler(f'A field handler must be registered on {cls.__name__} for '
+                                                  f'a field named `{field.name}` because it is declared as '
+                                                  f'calculatable.'
+                                                  )
+                    field_dependencies[field.name] = tuple(depends_on_fields)
 
-            fields_name_map = {}
-            dependent_fields_present = False
+            return field_dependencies
 
-            for field in fields:
-                if field.metadata.get(FieldMeta.DEPENDS_ON_FIELDS):
-                    dependent_fields_present = True
-                fields_name_map.update({field.name: field for field in dataclasses.fields(cls)})
+        def __pdc_determine_field_handling_order__(cls):
+            fields = dataclasses.fields(cls)
 
-            if not dependent_fields_present:
+            if not cls.__pdc_field_dependencies__:
                 # bail out of toposort
                 return fields
 
+            fields_name_map = {field.name: field for field in fields}
             fields_handling_dependency_graph = {
-                field.name: set(field.metadata.get(FieldMeta.DEPENDS_ON_FIELDS, {})) for field in fields
+                field.name: cls.__pdc_field_dependencies__.get(field.name, ()) for field in fields
             }
 
             fields_handling_execution_order = TopologicalSorter(fields_handling_dependency_graph).static_order()
 
-            return [fields_name_map[field_name] for field_name in fields_handling_execution_order]
+            return tuple(fields_name_map[field_name] for field_name in fields_handling_execution_order)
 
+        klass.__pdc_field_dependencies__ = __pdc_determine_field_dependencies__(klass)
         klass.__pdc_field_handling_order__ = __pdc_determine_field_handling_order__(klass)
+        klass.__pdc_resolved_types__ = _resolve_field_types(klass)
+        klass.__pdc_plan__ = _create_fields_plan(klass)
+        klass.__pdc_field_names__ = tuple(field.name for field in dataclasses.fields(klass))
+        _install_generated_methods(klass, lambda method_name: _inherits_replaceable(klass, spec, method_name))
 
-        if klass.Meta.singleton:
+        if meta.singleton:
             klass.__singleton_instance__ = None
 
             def __singleton__new__(cls, *args, **kwargs):
-                if cls.__singleton_instance__ is None:
-                    cls.__singleton_instance__ = object.__new__(cls)
-                return cls.__singleton_instance__
+                instance = cls.__singleton_instance__
+                if instance is None:
+                    instance = cls.__singleton_instance__ = object.__new__(cls)
+                return instance
 
             def get_instance(cls):
-                if cls.__singleton_instance__:
-                    return cls.__singleton_instance__
+                return cls.__singleton_instance__
 
             klass.__new__ = staticmethod(__singleton__new__)
             klass.get_instance = classmethod(get_instance)
@@ -213,11 +689,22 @@ class PowerDataclassBase(type):
 # field handlers must return a value and will be used to cast values to the type they're registered on.
 # field handlers can also be used a tool to calculate values of a field based on the values of other fields.
 # See `FieldMeta.DEPENDS_ON_FIELDS` to achieve this behaviour.
-field_handler = partial(setfuncattr, '__pdc_field_handler_field__')
+def field_handler(field_name: str):
+    def _inner(method):
+        method.__pdc_field_handler_field__ = field_name
+        return method
+
+    return _inner
+
 
 # wrap a PDC's method with this decorator to register it as a type handler.
 # type handlers must return a value and will be used to cast values to the type they're registered on.
-type_handler = partial(setfuncattr, '__pdc_type_handler_type__')
+def type_handler(_type: Any):
+    def _inner(method):
+        method.__pdc_type_handler_type__ = _type
+        return method
+
+    return _inner
 
 
 class FieldMeta(Enum):
@@ -267,66 +754,56 @@ def calculated_field(depends_on_fields=None, *args, **kwargs):
     return field(*args, **kwargs)
 
 
-class PowerDataclass(metaclass=PowerDataclassBase):
-    def __post_init__(self):
-        self.__pdc_handle_fields__()
+def _convert_to_dict(v, force):
+    if type(v) in _SCALAR_TYPES:
+        return v
 
-    def __pdc_handle_fields__(self):
-        for field in self.__pdc_field_handling_order__:
-            field_value = getattr(self, field.name)
+    if dataclasses.is_dataclass(v):
+        if isinstance(v, PowerDataclass):
+            if v.__pdc_as_dict_ignore_when_nested__ and not force:
+                return v
+            return v.as_dict(force=force)
+        # plain dataclass. `dataclasses.asdict` is not used, because it deep-copies every leaf value
+        return {f.name: _convert_to_dict(getattr(v, f.name), force) for f in dataclasses.fields(v)}
 
-            if field.metadata.get(FieldMeta.SKIP_TYPECASTING, False):
-                continue
-
-            if field.name in self.__pdc_field_handlers__:
-                field_value = self.__pdc_field_handlers__[field.name](self, field_value)
-            elif field.type in self.__pdc_type_handlers__:
-                field_value = self.__pdc_type_handlers__[field.type](self, field_value)
-            else:
-                if field_value is None:
-                    # Turns out, there _is_ a way to check for a missing default ᕕ( ᐛ )ᕗ
-                    field_has_default = (field.default is not dataclasses.MISSING)
-                    if field.metadata.get(FieldMeta.NULLABLE, False) or field_has_default:
-                        continue
-                    else:
-                        raise ValueError(f'A value for {self.__class__.__name__} field `{field.name}` cannot be None')
+    if isinstance(v, Mapping):
+        items = {k: _convert_to_dict(vv, force) for k, vv in v.items()}
+        if isinstance(v, defaultdict):
+            # a defaultdict has to be rebuilt with its default factory, just like `dataclasses.asdict` does it
+            return type(v)(v.default_factory, items)
+        return type(v)(items)
+    elif _is_iterable_but_not_string(v):
+        if isinstance(v, tuple) and hasattr(v, '_fields'):
+            # namedtuples take their items as separate arguments
+            return type(v)(*[_convert_to_dict(i, force) for i in v])
+        return type(v)((_convert_to_dict(i, force) for i in v))
 
-                field_value = powercast(field_value, field.type, self.__bound_pdc_type_handlers__)
+    # in other cases, just return the value as-is
+    return v
 
-            setattr(self, field.name, field_value)
 
-    @property
-    def __bound_pdc_type_handlers__(self):
-        return {k: partial(v, self) for k, v in self.__pdc_type_handlers__.items()}
-
-    def as_dict(self, force=False):
-        asdict_dict = {f.name: getattr(self, f.name) for f in dataclasses.fields(self)}
+class PowerDataclass(metaclass=PowerDataclassBase):
+    # empty slots here allow the `Meta.dataclass_slots` subclasses to go without a `__dict__`
+    __slots__ = ()
 
-        def _convert_to_dict(v):
-            if dataclasses.is_dataclass(v):
-                if isinstance(v, PowerDataclass):
-                    if v.Meta.as_dict_ignore_when_nested and not force:
-                        return v
-                    return v.as_dict(force=force)
-                # plain dataclass
-                return dataclasses.asdict(v)
+    def __post_init__(self):
+        # `__pdc_handle_fields__` is generated by the metaclass for every PowerDataclass, see `_create_fields_handler`
+        self.__pdc_handle_fields__()
 
-            if _is_iterable_but_not_string(v):
-                return type(v)((_convert_to_dict(i) for i in v))
-            elif isinstance(v, Mapping):
-                return type(v)(**{k: _convert_to_dict(vv) for k, vv in v.items()})
+    __post_init__.__pdc_replaceable__ = True
 
-            # in other cases, just return the value as-is
-            return v
+    def as_dict(self, force=False):
+        # a PowerDataclass which does not override `as_dict` gets one generated by the metaclass, see `_create_as_dict`
+        return _fields_to_dict(self, force)
 
-        return {k: _convert_to_dict(v) for k, v in asdict_dict.items()}
+    as_dict.__pdc_replaceable__ = True
 
     def as_json(self, force=False):
-        return json.dumps(self.as_dict(force), cls=self.Meta.json_encoder)
+        return json.dumps(self.as_dict(force), cls=self.__pdc_json_encoder__)
 
     @classmethod
     def from_json(cls, json_string: str):
-        return cls(**json.loads(json_string, cls=cls.Meta.json_decoder))
+        return cls(**json.loads(json_string, cls=cls.__pdc_json_decoder__))
 
     def merge(self, other):
         """
@@ -347,11 +824,11 @@ class PowerDataclass(metaclass=PowerDataclassBase):
                 f"Can't get a diff between an instance of {type(self)} and an instance of f{type(other)}"
             )
         diff_dict = {}
-        for field in dataclasses.fields(self):
-            self_value = getattr(self, f'{field.name}')
-            other_value = getattr(other, f'{field.name}')
+        for field_name in self.__pdc_field_names__:
+            self_value = getattr(self, field_name)
+            other_value = getattr(other, field_name)
             if self_value != other_value:
-                diff_dict.update({f'{field.name}': (self_value, other_value)})
+                diff_dict[field_name] = (self_value, other_value)
         return diff_dict
 
 
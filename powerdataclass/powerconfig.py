@@ -23,18 +23,34 @@ def calculated_field(*args, **kwargs):
 
 
 class PowerConfig(PowerDataclass):
+    __slots__ = ()
+
     class Meta:
         envvar_prefix = "POWERCONFIG"
 
+    @classmethod
+    def __pdc_determine_env_map__(cls):
+        """
+        Returns a tuple of (field name, environment variable name) pairs for the fields which are read from the
+        environment. Computed once per class.
+        """
+        env_map = cls.__dict__.get('__pdc_env_map__')
+        if env_map is None:
+            envvar_prefix = cls.Meta.envvar_prefix.upper()
+            env_map = tuple(
+                (field.name, f'{envvar_prefix}_{field.name.upper()}') for field in fields(cls)
+                if not field.metadata.get(PowerConfigFieldMeta.IGNORE_ENVIRON, False)
+            )
+            cls.__pdc_env_map__ = env_map
+        return env_map
+
     @classmethod
     def from_environ(cls):
         envdict = {}
-        for field in fields(cls):
-            if not field.metadata.get(PowerConfigFieldMeta.IGNORE_ENVIRON, False):
-                env_key = f'{cls.Meta.envvar_prefix.upper()}_{field.name.upper()}'
-                env_value = environ.get(env_key)
-                if env_value:
-                    envdict.update({field.name: env_value})
+        for field_name, env_key in cls.__pdc_determine_env_map__():
+            env_value = environ.get(env_key)
+            if env_value:
+                envdict[field_name] = env_value
 
         return cls(**envdict)
 
@@ -52,5 +68,7 @@ class PowerConfig(PowerDataclass):
 
 
 class GlobalPowerConfig(PowerConfig):
+    __slots__ = ()
+
     class Meta:
         singleton = True
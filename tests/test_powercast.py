@@ -193,3 +193,105 @@ def test_dataclass_unpack_casting_from_bytes_is_processed_correctly():
 
     v = powercast(b'abcde', DC)
     assert v.x == b'abcde'
+
+
+def test_powercast_caches_casters_per_type():
+    from powerdataclass import _get_caster
+
+    _type = typing.List[int]
+    powercast(['1'], _type)
+    cached = _get_caster(_type)
+
+    assert powercast(('2', 3.0), _type) == [2, 3]
+    assert _get_caster(_type) is cached
+
+
+def test_powercast_caches_a_single_caster_for_equal_types():
+    from powerdataclass import _get_alias_caster
+
+    powercast(['1'], list[int])
+    cache_size = _get_alias_caster.cache_info().currsize
+    for _ in range(100):
+        assert powercast(['1'], list[int]) == [1]
+    assert _get_alias_caster.cache_info().currsize == cache_size
+
+
+def test_powercast_caster_cache_does_not_keep_classes_alive():
+    import gc
+    import weakref
+
+    class_refs = []
+    for i in range(10):
+        @dataclasses.dataclass
+        class DC:
+            x: int
+
+        class Plain:
+            def __init__(self, v):
+                self.v = v
+
+        assert powercast({'x': i}, DC) == DC(i)
+        assert powercast(i, Plain).v == i
+        class_refs.extend((weakref.ref(DC), weakref.ref(Plain)))
+
+    del DC, Plain
+    gc.collect()
+    assert all(class_ref() is None for class_ref in class_refs)
+
+
+def test_powercast_type_handlers_are_respected_for_mapping_keys():
+    def handle_int(v):
+        return int(v) ** 2
+
+    v = powercast({'2': '3'}, typing.Dict[int, int], {int: handle_int})
+    assert v == {4: 9}
+
+
+def test_powercast_primitive_items_are_cast_by_their_type():
+    v = powercast(['1', 2, 3.5, True], typing.List[int])
+    assert v == [1, 2, 3, 1]
+    assert all(type(i) is int for i in v)
+
+    v = powercast([1, 0, '', 'n'], typing.Tuple[bool])
+    assert v == (True, False, False, True)
+
+
+def test_powercast_type_handlers_are_respected_for_nested_items():
+    def handle_int(v):
+        return int(v) ** 2
+
+    v = powercast([['2'], ('3', 4.0)], typing.List[typing.List[int]], {int: handle_int})
+    assert v == [[4], [9, 16]]
+
+    v = powercast({'a': ['2']}, typing.Dict[str, typing.Set[int]], {int: handle_int})
+    assert v == {'a': {4}}
+
+
+def test_powercast_casts_array_likes_by_iterating_them():
+    import array
+
+    v = powercast(array.array('d', [1.0, 2.5]), typing.List[float])
+    assert v == [1.0, 2.5]
+    assert all(type(i) is float for i in v)
+
+    v = powercast(array.array('l', [1, 2]), typing.Tuple[str])
+    assert v == ('1', '2')
+
+    class WithToList(list):
+        def tolist(self):
+            raise AssertionError('tolist must not be called')
+
+    assert powercast(WithToList(['1', '2']), typing.List[int]) == [1, 2]
+
+
+def test_powercast_sequences_of_items_of_the_right_type_are_copied():
+    value = [1, 2, 3]
+    v = powercast(value, typing.List[int])
+    assert v == value
+    assert v is not value
+
+    v = powercast([1, True, '3'], typing.List[int])
+    assert v == [1, 1, 3]
+    assert all(type(i) is int for i in v)
+
+    assert powercast(iter((1, 2)), typing.Tuple[int]) == (1, 2)
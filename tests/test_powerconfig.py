@@ -24,3 +24,20 @@ def test_powerconfig_skips_reading_from_env_for_marked_fields(monkeypatch):
 
     assert pc.a == 1
     assert pc.b == 3
+
+
+def test_powerconfig_env_map_is_computed_per_class(monkeypatch):
+    monkeypatch.setenv('POWERCONFIG_A', '1')
+    monkeypatch.setenv('CNF_A', '2')
+
+    class PC(PowerConfig):
+        a: int
+
+    class PC2(PC):
+        class Meta:
+            envvar_prefix = 'cnf'
+
+    assert PC.from_environ().a == 1
+    assert PC2.from_environ().a == 2
+    assert PC.__pdc_env_map__ == (('a', 'POWERCONFIG_A'),)
+    assert PC2.__pdc_env_map__ == (('a', 'CNF_A'),)
@@ -1,3 +1,4 @@
+import dataclasses
 import typing
 from enum import Enum
 from json import JSONEncoder, JSONDecoder
@@ -23,6 +24,76 @@ def test_pdc_calls_powercast_for_types_not_handled_by_handlers():
         ]
 
 
+def test_pdc_does_not_call_powercast_for_values_of_declared_type():
+    class PDC(PowerDataclass):
+        x: int
+        y: str
+
+    with mock.patch('powerdataclass.powercast') as powercast_mock:
+        pdc = PDC(1, 2)
+
+        assert powercast_mock.call_args_list == [
+            mock.call(2, str, PDC.__pdc_type_handlers__)
+        ]
+        assert pdc.x == 1
+
+
+def test_pdc_resolves_string_annotations():
+    class PDC(PowerDataclass):
+        x: 'int'
+        y: 'typing.List[str]'
+
+    assert PDC.__pdc_resolved_types__ == {'x': int, 'y': typing.List[str]}
+
+    pdc = PDC('1', [2])
+    assert pdc.x == 1
+    assert pdc.y == ['2']
+
+
+def test_pdc_keeps_unresolvable_string_annotations():
+    class PDC(PowerDataclass):
+        x: 'typing.DoesNotExist' = noncasted_field(default=None)
+        y: 'not a valid annotation' = noncasted_field(default=None)
+
+    assert PDC.__pdc_resolved_types__ == {'x': 'typing.DoesNotExist', 'y': 'not a valid annotation'}
+    assert PDC(1).x == 1
+
+
+def test_pdc_resolves_self_referencing_string_annotations():
+    class Node(PowerDataclass):
+        name: 'str'
+        size: 'int'
+        children: 'typing.List[Node]' = field(default_factory=list)
+
+    assert Node.__pdc_resolved_types__ == {'name': str, 'size': int, 'children': typing.List[Node]}
+
+    node = Node('a', '1', [{'name': 'b', 'size': '2'}])
+    assert node.size == 1
+    assert node.children == [Node('b', 2)]
+
+
+def test_pdc_resolves_string_annotations_field_by_field():
+    class PDC(PowerDataclass):
+        x: 'int'
+        y: 'typing.DoesNotExist' = noncasted_field(default=None)
+
+    assert PDC.__pdc_resolved_types__ == {'x': int, 'y': 'typing.DoesNotExist'}
+    assert PDC('1').x == 1
+
+
+class ForwardReferencingPDC(PowerDataclass):
+    child: 'ForwardReferencedPDC'
+
+
+class ForwardReferencedPDC(PowerDataclass):
+    x: int
+
+
+def test_pdc_resolves_forward_references_on_first_instantiation():
+    assert ForwardReferencingPDC({'x': '1'}).child == ForwardReferencedPDC(1)
+    assert ForwardReferencingPDC.__pdc_resolved_types__ == {'child': ForwardReferencedPDC}
+
+
 def test_pdc_calls_type_handlers_for_registered_types():
     int_handler_mock = mock.MagicMock()
     str_handler_mock = mock.MagicMock()
@@ -254,6 +325,19 @@ def test_pdc_dependent_fields_field_handlers_execution_order():
     assert recorded_handlers_execution_order == ['d', 'c', 'e', 'b', 'f', 'a']
 
 
+def test_pdc_dependent_fields_are_collected_on_the_class():
+    class PDC(PowerDataclass):
+        a: int
+        b: int = calculated_field(depends_on_fields=['a'])
+        c: int = field(default=0, metadata={FieldMeta.DEPENDS_ON_FIELDS: []})
+
+        @field_handler('b')
+        def handle_b(self, v):
+            return self.a
+
+    assert PDC.__pdc_field_dependencies__ == {'b': ('a',)}
+
+
 def test_pdc_recreatable_from_dict_form():
     class PDC(PowerDataclass):
         x: int
@@ -270,6 +354,19 @@ def test_pdc_recreatable_from_dict_form():
     assert initial == recreated
 
 
+def test_pdc_as_dict_keeps_fields_declaration_order():
+    class PDC(PowerDataclass):
+        a: int = calculated_field(depends_on_fields=['b'])
+        b: int = 1
+
+        @field_handler('a')
+        def handle_a(self, v):
+            return self.b + 1
+
+    assert PDC.__pdc_field_names__ == ('a', 'b')
+    assert list(PDC().as_dict().items()) == [('a', 2), ('b', 1)]
+
+
 def test_pdc_recreatable_from_json_form():
     class PDC(PowerDataclass):
         x: int
@@ -282,6 +379,19 @@ def test_pdc_recreatable_from_json_form():
     assert initial == recreated
 
 
+def test_pdc_with_nested_pdcs_recreatable_from_json_form():
+    class PDCNested(PowerDataclass):
+        a: int
+        b: typing.Dict[str, typing.List[float]]
+
+    class PDC(PowerDataclass):
+        nested: typing.List[PDCNested]
+
+    initial = PDC([PDCNested(1, {'x': [1.5, 2]}), PDCNested(2, {})])
+    recreated = PDC.from_json(initial.as_json())
+    assert initial == recreated
+
+
 def test_pdc_with_nested_pdcs_recreatable_from_dict_form():
     class PDCNestedNested(PowerDataclass):
         n: str
@@ -316,6 +426,42 @@ def test_pdc_with_nested_pdcs_recreatable_from_dict_form():
     assert initial == recreated
 
 
+def test_pdc_as_dict_converts_nested_mappings_and_plain_dataclasses():
+    @dataclasses.dataclass
+    class DC:
+        items: typing.List[int]
+
+    class PDC(PowerDataclass):
+        mapping: typing.Dict[int, DC]
+
+    pdc = PDC({'1': {'items': [2, 3]}})
+    dict_form = pdc.as_dict()
+    assert dict_form == {'mapping': {1: {'items': [2, 3]}}}
+    assert dict_form['mapping'][1]['items'] is not pdc.mapping[1].items
+
+
+def test_pdc_as_dict_converts_nested_namedtuples_and_defaultdicts():
+    from collections import defaultdict, namedtuple
+
+    Point = namedtuple('Point', ['x', 'y'])
+
+    @dataclasses.dataclass
+    class DC:
+        p: Point
+
+    class PDC(PowerDataclass):
+        dc: DC = noncasted_field()
+        counts: defaultdict = noncasted_field()
+
+    pdc = PDC(DC(Point(1, 2)), defaultdict(list, {'a': [DC(Point(3, 4))]}))
+    dict_form = pdc.as_dict()
+
+    assert dict_form == {'dc': {'p': Point(1, 2)}, 'counts': {'a': [{'p': Point(3, 4)}]}}
+    assert type(dict_form['dc']['p']) is Point
+    assert type(dict_form['counts']) is defaultdict
+    assert dict_form['counts'].default_factory is list
+
+
 def test_powerdataclass_as_dict_ignore_when_nested_keeps_pdc_class_if_declared_in_meta():
     class NestedPDC(PowerDataclass):
         y: int
@@ -453,3 +599,60 @@ def test_powerdataclass_diff_uncomparable_types():
     one, other = DiffPDC1(1, 2, 3), DiffPDC2('a', 'b', 'c')
     with pytest.raises(DiffImpossible):
         one.diff(other)
+
+
+def test_pdc_casts_fields_not_set_by_init():
+    class PDC(PowerDataclass):
+        a: int
+        b: int = field(init=False, default=3)
+
+    assert PDC('4') == PDC(4)
+    assert (PDC('4').a, PDC('4').b) == (4, 3)
+
+
+def test_pdc_casts_fields_if_dataclass_init_is_disabled():
+    class PDC(PowerDataclass):
+        a: int
+        b: int = 3
+
+        class Meta:
+            dataclass_init = False
+
+        def __init__(self, a):
+            self.a = a
+            self.__post_init__()
+
+    pdc = PDC('4')
+    assert (pdc.a, pdc.b) == (4, 3)
+
+
+def test_pdc_sets_cast_values_through_custom_setattr():
+    assignments = []
+
+    class PDC(PowerDataclass):
+        a: int
+
+        def __setattr__(self, key, value):
+            assignments.append((key, value))
+            super().__setattr__(key, value)
+
+    PDC('1')
+    assert assignments == [('a', '1'), ('a', 1)]
+
+
+def test_pdc_as_dict_does_not_keep_classes_of_values_alive():
+    import gc
+    import weakref
+
+    class Value:
+        pass
+
+    class PDC(PowerDataclass):
+        x: Value = noncasted_field()
+
+    assert type(PDC(Value()).as_dict()['x']) is Value
+
+    class_ref = weakref.ref(Value)
+    del Value, PDC
+    gc.collect()
+    assert class_ref() is None
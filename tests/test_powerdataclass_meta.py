@@ -1,3 +1,5 @@
+import dataclasses
+
 from powerdataclass import PowerDataclass, field_handler, type_handler
 
 
@@ -160,3 +162,245 @@ def test_pdc_metaclass_declaring_one_dataclass_singleton_does_not_make_other_dat
 
     assert id(singleton1) == id(singleton1)
     assert singleton1.a == singleton2.a
+
+
+def test_pdc_metaclass_generates_fields_handler_for_every_pdc():
+    class PDC(PowerDataclass):
+        a: int
+
+    class PDC2(PDC):
+        b: str
+
+    assert PDC.__pdc_handle_fields__ is not PDC2.__pdc_handle_fields__
+    assert PDC2.__pdc_handle_fields__.__qualname__.endswith('PDC2.__pdc_handle_fields__')
+
+    pdc2 = PDC2('1', 2)
+    assert pdc2.a == 1
+    assert pdc2.b == '2'
+
+
+def test_pdc_metaclass_precomputes_fields_plan():
+    from powerdataclass import nullable_field, noncasted_field, \
+        _FIELD_SKIP_TYPECASTING, _FIELD_NULLABLE, _FIELD_HAS_DEFAULT
+
+    class PDC(PowerDataclass):
+        a: int
+        b: str = nullable_field()
+        c: bool = noncasted_field(default=False)
+
+        @field_handler('a')
+        def handle_a(self, v):
+            return v
+
+    assert PDC.__pdc_plan__ == (
+        ('a', int, PDC.handle_a, 0),
+        ('b', str, None, _FIELD_NULLABLE),
+        ('c', bool, None, _FIELD_SKIP_TYPECASTING | _FIELD_HAS_DEFAULT),
+    )
+
+
+def test_pdc_metaclass_slots_mode():
+    class PDC(PowerDataclass):
+        a: int
+        b: str = 'b'
+
+        class Meta:
+            dataclass_slots = True
+
+        def as_dict(self, force=False):
+            return super().as_dict(force)
+
+    class PDC2(PDC):
+        c: float = 0.5
+
+    pdc2 = PDC2('1', 2)
+
+    assert not hasattr(pdc2, '__dict__')
+    assert PDC2.__slots__ == ('c',)
+    assert pdc2.as_dict() == {'a': 1, 'b': '2', 'c': 0.5}
+
+
+def test_pdc_metaclass_slotted_parent_with_non_slotted_child():
+    class PDC(PowerDataclass):
+        a: int
+
+        class Meta:
+            dataclass_slots = True
+
+    class PDC2(PDC):
+        b: int
+
+        class Meta:
+            dataclass_slots = False
+
+    pdc2 = PDC2('1', '2')
+    assert (pdc2.a, pdc2.b) == (1, 2)
+    assert pdc2.__dict__ == {'b': 2}
+
+
+def test_pdc_metaclass_singleton_mode_can_be_reset():
+    class PDCSingleton(PowerDataclass):
+        a: int
+
+        class Meta:
+            singleton = True
+
+    assert PDCSingleton.get_instance() is None
+    singleton1 = PDCSingleton(1)
+    assert PDCSingleton.get_instance() is singleton1
+
+    PDCSingleton.__singleton_instance__ = None
+    singleton2 = PDCSingleton(2)
+    assert singleton2 is not singleton1
+    assert PDCSingleton.get_instance() is singleton2
+
+
+def test_pdc_metaclass_registers_handlers_respects_overwrites_in_inheritance_of_arbitrary_depth():
+    class PDC(PowerDataclass):
+        @field_handler('field')
+        def handle_field(self, v):
+            return v
+
+        @type_handler(bool)
+        def handle_type(self, v):
+            return v
+
+    class PDC2(PDC):
+        @field_handler('field')
+        def handle_field2(self, v):
+            return v
+
+        @type_handler(bool)
+        def handle_type2(self, v):
+            return v
+
+    class PDC3(PDC2):
+        pass
+
+    assert PDC3.__pdc_type_handlers__ == {bool: PDC2.handle_type2}
+    assert PDC3.__pdc_field_handlers__ == {'field': PDC2.handle_field2}
+
+
+def test_pdc_metaclass_generated_post_init_respects_user_defined_post_init():
+    post_init_calls = []
+
+    class PDC(PowerDataclass):
+        a: int
+
+    class PDC2(PDC):
+        b: int
+
+        def __post_init__(self):
+            post_init_calls.append(self)
+            super().__post_init__()
+
+    class PDC3(PDC2):
+        c: int
+
+    assert PDC.__post_init__.__qualname__.endswith('PDC.__post_init__')
+    assert PDC3.__post_init__ is PDC2.__post_init__
+
+    pdc3 = PDC3('1', '2', '3')
+    assert (pdc3.a, pdc3.b, pdc3.c) == (1, 2, 3)
+    assert post_init_calls == [pdc3]
+
+
+def test_pdc_metaclass_slots_mode_keeps_explicitly_declared_slots():
+    class PDC(PowerDataclass):
+        __slots__ = ()
+
+        class Meta:
+            dataclass_slots = True
+
+    class PDC2(PDC):
+        a: int
+
+    assert PDC.__slots__ == ()
+    assert PDC2('1').a == 1
+    assert not hasattr(PDC2(1), '__dict__')
+
+
+def test_pdc_metaclass_generated_as_dict_respects_user_defined_as_dict():
+    class PDC(PowerDataclass):
+        a: int
+
+    class PDC2(PDC):
+        b: int
+
+        def as_dict(self, force=False):
+            return {**super().as_dict(force), 'extra': True}
+
+    class PDC3(PDC2):
+        c: int
+
+    assert PDC.as_dict.__qualname__.endswith('PDC.as_dict')
+    assert PDC3.as_dict is PDC2.as_dict
+    assert PDC3(1, 2, 3).as_dict() == {'a': 1, 'b': 2, 'c': 3, 'extra': True}
+
+
+def test_pdc_metaclass_registers_handlers_respects_mro_in_multiple_inheritance():
+    class PDC(PowerDataclass):
+        @field_handler('field')
+        def handle_field(self, v):
+            return v
+
+    class PDCLeft(PDC):
+        pass
+
+    class PDCRight(PDC):
+        @field_handler('field')
+        def handle_field_right(self, v):
+            return v
+
+    class PDCBoth(PDCLeft, PDCRight):
+        pass
+
+    assert PDCBoth.__pdc_field_handlers__ == {'field': PDCRight.handle_field_right}
+
+
+def test_pdc_metaclass_stores_collapsed_meta_params():
+    class PDC(PowerDataclass):
+        class Meta:
+            singleton = True
+
+    class PDC2(PDC):
+        class Meta:
+            dataclass_repr = False
+
+    assert PDC2.__pdc_meta__.singleton is True
+    assert PDC2.__pdc_meta__.dataclass_repr is False
+    assert PDC2.__pdc_meta__.dataclass_init is True
+    assert PDC.__pdc_meta__.dataclass_repr is True
+
+
+def test_pdc_metaclass_supports_explicit_slotted_dataclass_decorator():
+    @dataclasses.dataclass(slots=True)
+    class PDC(PowerDataclass):
+        a: int
+        b: str = 'b'
+
+    pdc = PDC('1', 2)
+
+    assert not hasattr(pdc, '__dict__')
+    assert (pdc.a, pdc.b) == (1, '2')
+    assert pdc.as_dict() == {'a': 1, 'b': '2'}
+
+
+def test_pdc_metaclass_slots_mode_leaves_borrowed_methods_bound_to_their_classes():
+    class A:
+        def hello(self):
+            return super().__repr__()
+
+    class PDC(PowerDataclass):
+        a: int
+
+        hello = A.hello
+
+        class Meta:
+            dataclass_slots = True
+
+        def as_dict(self, force=False):
+            return super().as_dict(force)
+
+    assert A().hello().startswith('<')
+    assert PDC('1').as_dict() == {'a': 1}